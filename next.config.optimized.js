@@ -30,6 +30,25 @@ const nextConfig = {
           },
         ],
       },
+      // Manifestos mudam a cada otimização: sempre revalidar
+      {
+        source: '/images/image_manifest.json',
+        headers: [
+          {
+            key: 'Cache-Control',
+            value: 'public, max-age=0, must-revalidate',
+          },
+        ],
+      },
+      {
+        source: '/images/:category/sprite.json',
+        headers: [
+          {
+            key: 'Cache-Control',
+            value: 'public, max-age=0, must-revalidate',
+          },
+        ],
+      },
     ]
   },
 }
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+⚖️ HIPERLIGA IMAGE BUDGET CHECK
+Cruza image_catalog.json com optimization_report.json e verifica o peso
+de imagens por página contra src/lib/performance-budgets.ts
+
+Uso:
+    python3 image_budgets.py            # Apenas análise
+    python3 image_budgets.py --enforce  # Re-otimiza imagens das páginas acima do orçamento
+    python3 image_budgets.py --enforce --hashed  # Força nomes com hash (detectado pelo relatório/manifesto)
+"""
+
+import re
+import json
+import time
+import argparse
+from pathlib import Path
+from urllib.parse import urlparse
+
+from optimize_images import (
+    ImageOptimizer, IMAGES_DIR, BREAKPOINTS, CATALOG_FILE, MANIFEST_FILE, HASHED_STEM_PATTERN
+)
+
+# Configuração
+BUDGETS_FILE = Path("../src/lib/performance-budgets.ts")
+REPORT_FILE = IMAGES_DIR / "optimization_report.json"
+BUDGET_REPORT_FILE = IMAGES_DIR / "image_budget_report.json"
+
+# Ordem de preferência quando dois formatos têm o mesmo tamanho
+FORMATS = ['avif', 'webp', 'jpg']
+
+# Páginas do site original (catálogo) → rotas do novo site
+LEGACY_PAGE_PATHS = {
+    '/hiperliga': '/produtos/hiperliga',
+    '/gran-finelle': '/produtos/texturas',
+    '/sobre-nos': '/sobre',
+}
+
+# Configurações progressivamente mais agressivas para --enforce
+STRICTER_QUALITY_STEPS = [
+    {'webp': 70, 'avif': 55, 'jpg': 75},
+    {'webp': 60, 'avif': 58, 'jpg': 65},
+    {'webp': 50, 'avif': 63, 'jpg': 55},
+]
+
+
+def load_performance_budgets(path=BUDGETS_FILE):
+    """Extrair orçamentos de assets/requests por tipo de página do arquivo TS"""
+    source = Path(path).read_text(encoding='utf-8')
+    block_pattern = re.compile(
+        r'^\s{2}(\w+): \{\s*assets: \{(.*?)\}.*?requests: \{(.*?)\}', re.S | re.M
+    )
+    value_pattern = re.compile(r'(\w+):\s*(\d+(?:\.\d+)?)')
+
+    budgets = {}
+    for page_type, assets, requests in block_pattern.findall(source):
+        assets = {key: float(value) for key, value in value_pattern.findall(assets)}
+        requests = {key: int(float(value)) for key, value in value_pattern.findall(requests)}
+
+        # Orçamento de imagens da página: o que sobra do total após JS, CSS e fontes
+        page_images_kb = assets['total'] - assets['javascript'] - assets['css'] - assets['fonts']
+
+        budgets[page_type] = {
+            'page_images_kb': page_images_kb,
+            'per_image_kb': assets['images'],
+            'image_requests': requests.get('images')
+        }
+
+    return budgets
+
+
+def page_route(page_url):
+    """Converter URL do catálogo para a rota correspondente no novo site"""
+    path = urlparse(page_url).path.rstrip('/') or '/'
+    return LEGACY_PAGE_PATHS.get(path, path)
+
+
+def page_type_for_route(route):
+    """Mesma regra de getPageTypeBudget() em performance-budgets.ts"""
+    if route == '/':
+        return 'homepage'
+    if route.startswith('/produtos/'):
+        return 'product'
+    if route == '/contato':
+        return 'form'
+    return 'content'
+
+
+def file_size(path):
+    path = Path(path)
+    return path.stat().st_size if path.exists() else None
+
+
+def best_variant(candidates):
+    """Escolher o menor arquivo existente entre {formato: caminho}"""
+    best = None
+    for fmt in FORMATS:
+        size = file_size(candidates[fmt]) if candidates.get(fmt) else None
+        if size is not None and (best is None or size < best['size']):
+            best = {'format': fmt, 'path': str(candidates[fmt]), 'size': size}
+    return best
+
+
+def shipped_bytes(entry):
+    """Bytes entregues por breakpoint no melhor formato disponível"""
+    source = Path(entry['original_path'])
+    # Relatórios antigos não têm optimized_versions: nomes estáveis {stem}-optimized.{fmt}
+    optimized = entry.get('optimized_versions') or {
+        fmt: source.parent / f"{source.stem}-optimized.{fmt}" for fmt in FORMATS
+    }
+
+    if entry.get('animated'):
+        outputs = {fmt: data['path'] for fmt, data in entry.get('animated_outputs', {}).items()
+                   if fmt in FORMATS}
+        animated_best = best_variant(outputs)
+        return {breakpoint: animated_best for breakpoint in BREAKPOINTS}
+
+    versions = entry.get('responsive_versions', {})
+    shipped = {}
+    for breakpoint in BREAKPOINTS:
+        responsive = {fmt: versions.get(f'{breakpoint}_{fmt}') for fmt in FORMATS}
+        # Sem versão responsiva (imagem menor que o breakpoint): usa a otimizada
+        shipped[breakpoint] = best_variant(responsive) or best_variant(optimized)
+    return shipped
+
+
+class ImageBudgetChecker:
+    def __init__(self):
+        self.budgets = load_performance_budgets()
+        self.catalog = self.load_json(CATALOG_FILE)
+        self.report = self.load_json(REPORT_FILE)
+        self.assets = {}  # original resolvido → estado compartilhado entre as páginas
+
+    def load_json(self, path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def uses_hashed_names(self):
+        """Detectar se a última otimização usou --hashed (relatório ou manifesto)"""
+        paths = []
+        for entry in self.report['images']:
+            paths.extend((entry.get('optimized_versions') or {}).values())
+            paths.extend((entry.get('responsive_versions') or {}).values())
+        if not paths and MANIFEST_FILE.exists():
+            manifest = self.load_json(MANIFEST_FILE)
+            for image in manifest.get('images', {}).values():
+                paths.extend(image.get('optimized', {}).values())
+        return any(HASHED_STEM_PATTERN.search(Path(path).stem) for path in paths)
+
+    def report_entries(self):
+        """Indexar entradas do relatório pelo caminho absoluto do original"""
+        return {Path(entry['original_path']).resolve(): entry for entry in self.report['images']}
+
+    def analyze(self):
+        """Calcular bytes de imagem por página e breakpoint e marcar violações"""
+        entries = self.report_entries()
+        pages = {}
+
+        for image in self.catalog['images']:
+            route = page_route(image['page'])
+            page_type = page_type_for_route(route)
+            page = pages.setdefault(route, {
+                'route': route,
+                'page_type': page_type,
+                'budget': self.budgets[page_type],
+                'images': [],
+                'missing': []
+            })
+
+            entry = entries.get(Path(image['local_path']).resolve())
+            if entry is None:
+                page['missing'].append(image['local_path'])
+                continue
+
+            # Mesmo dict em todas as páginas: re-otimizar atualiza todas de uma vez
+            key = Path(entry['original_path']).resolve()
+            asset = self.assets.setdefault(key, {
+                'original_path': entry['original_path'],
+                'category': entry['category'],
+                'shipped': shipped_bytes(entry)
+            })
+            if asset not in page['images']:
+                page['images'].append(asset)
+
+        for page in pages.values():
+            self.evaluate_page(page)
+
+        return pages
+
+    def evaluate_page(self, page):
+        """Somar bytes por breakpoint e comparar com o orçamento da página"""
+        budget = page['budget']
+        page['totals_kb'] = {}
+        page['violations'] = []
+
+        for breakpoint in BREAKPOINTS:
+            total = sum(
+                image['shipped'][breakpoint]['size']
+                for image in page['images'] if image['shipped'][breakpoint]
+            )
+            total_kb = total / 1024
+            page['totals_kb'][breakpoint] = round(total_kb, 1)
+
+            if total_kb > budget['page_images_kb']:
+                page['violations'].append({
+                    'type': 'page_weight',
+                    'breakpoint': breakpoint,
+                    'actual_kb': round(total_kb, 1),
+                    'budget_kb': budget['page_images_kb']
+                })
+
+        for image in page['images']:
+            largest = max(
+                (variant['size'] for variant in image['shipped'].values() if variant), default=0
+            )
+            if largest / 1024 > budget['per_image_kb']:
+                page['violations'].append({
+                    'type': 'image_weight',
+                    'image': image['original_path'],
+                    'actual_kb': round(largest / 1024, 1),
+                    'budget_kb': budget['per_image_kb']
+                })
+
+        if budget['image_requests'] and len(page['images']) > budget['image_requests']:
+            page['violations'].append({
+                'type': 'image_requests',
+                'actual': len(page['images']),
+                'budget': budget['image_requests']
+            })
+
+        page['over_budget'] = any(
+            violation['type'] in ('page_weight', 'image_weight') for violation in page['violations']
+        )
+
+    def enforce(self, pages, hashed=False):
+        """Re-otimizar as maiores imagens das páginas acima do orçamento até caberem"""
+        # Mesmo modo de nomes da otimização original, senão o manifesto volta a nomes estáveis
+        optimizer = ImageOptimizer(hashed=hashed)
+        if not optimizer.check_dependencies():
+            print("❌ Dependências não atendidas. Abortando ajuste.")
+            return
+
+        for page in pages.values():
+            if not page['over_budget']:
+                continue
+
+            print(f"\n🔧 Ajustando {page['route']} ({page['page_type']})")
+
+            for step, quality in enumerate(STRICTER_QUALITY_STEPS):
+                optimizer.quality.update(quality)
+
+                # Maiores primeiro: maior ganho por re-codificação
+                images = sorted(
+                    page['images'],
+                    key=lambda image: max((v['size'] for v in image['shipped'].values() if v), default=0),
+                    reverse=True
+                )
+                for image in images:
+                    # Já re-otimizada neste nível (ou mais agressivo) por outra página
+                    if image.get('quality_step', -1) >= step:
+                        continue
+
+                    image_path = Path(image['original_path'])
+                    if not optimizer.optimize_single_image(image_path, image['category']):
+                        continue
+
+                    entry = optimizer.processed_images[-1]
+                    self.replace_report_entry(entry)
+                    image['shipped'] = shipped_bytes(entry)
+                    image['quality'] = quality
+                    image['quality_step'] = step
+
+                    # Reavaliar todas as páginas que usam a imagem
+                    for other in pages.values():
+                        if image in other['images']:
+                            self.evaluate_page(other)
+                    if not page['over_budget']:
+                        break
+
+                if not page['over_budget']:
+                    print(f"   ✅ Dentro do orçamento com qualidade {quality}")
+                    break
+            else:
+                print(f"   ⚠️  Ainda acima do orçamento após {len(STRICTER_QUALITY_STEPS)} níveis")
+
+        self.save_report()
+        if hashed and optimizer.processed_images:
+            # Derivados substituídos entram na lista de aposentados do manifesto
+            optimizer.collect_garbage(optimizer.gc_grace_days)
+
+    def replace_report_entry(self, entry):
+        """Substituir entrada do optimization_report.json pela re-otimização"""
+        target = Path(entry['original_path']).resolve()
+        images = self.report['images']
+        for i, existing in enumerate(images):
+            if Path(existing['original_path']).resolve() == target:
+                images[i] = entry
+                break
+        else:
+            images.append(entry)
+
+    def save_report(self):
+        """Regravar optimization_report.json com totais recalculados"""
+        images = self.report['images']
+        original = sum(image['original_size'] for image in images)
+        optimized = sum(image['optimized_size'] for image in images)
+
+        self.report['summary'].update({
+            'total_images': len(images),
+            'total_original_size_mb': original / 1024 / 1024,
+            'total_optimized_size_mb': optimized / 1024 / 1024,
+            'total_savings_mb': (original - optimized) / 1024 / 1024,
+            'total_savings_percent': ((original - optimized) / original) * 100 if original else 0,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        })
+
+        with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(self.report, f, indent=2, ensure_ascii=False)
+
+        print(f"📊 Relatório de otimização atualizado: {REPORT_FILE}")
+
+    def save_budget_report(self, pages):
+        report = {
+            'summary': {
+                'total_pages': len(pages),
+                'pages_over_budget': sum(1 for page in pages.values() if page['over_budget']),
+                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+            },
+            'pages': list(pages.values())
+        }
+
+        with open(BUDGET_REPORT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        print(f"📋 Relatório de orçamento salvo: {BUDGET_REPORT_FILE}")
+
+    def print_summary(self, pages):
+        print("\n" + "="*60)
+        print("⚖️  PESO DE IMAGENS POR PÁGINA")
+        print("="*60)
+
+        for route, page in sorted(pages.items()):
+            status = "❌" if page['over_budget'] else "✅"
+            totals = ' | '.join(f"{bp}: {kb:.0f}KB" for bp, kb in page['totals_kb'].items())
+            print(f"{status} {route} ({page['page_type']}, orçamento {page['budget']['page_images_kb']:.0f}KB)")
+            print(f"   {totals}")
+            for violation in page['violations']:
+                if violation['type'] == 'page_weight':
+                    print(f"   ⚠️  {violation['breakpoint']}: {violation['actual_kb']}KB > {violation['budget_kb']:.0f}KB")
+                elif violation['type'] == 'image_weight':
+                    print(f"   ⚠️  {Path(violation['image']).name}: {violation['actual_kb']}KB > "
+                          f"{violation['budget_kb']:.0f}KB por imagem")
+                else:
+                    print(f"   ⚠️  {violation['actual']} imagens > {violation['budget']} requisições")
+            if page['missing']:
+                print(f"   ⏭️  {len(page['missing'])} imagens sem entrada no relatório de otimização")
+
+    def run(self, enforce=False, hashed=False):
+        pages = self.analyze()
+        self.print_summary(pages)
+
+        if enforce:
+            if not hashed and self.uses_hashed_names():
+                print("\n🔑 Derivados com hash de conteúdo detectados: mantendo --hashed")
+                hashed = True
+            self.enforce(pages, hashed=hashed)
+            self.print_summary(pages)
+
+        self.save_budget_report(pages)
+        return not any(page['over_budget'] for page in pages.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Orçamento de peso de imagens por página")
+    parser.add_argument('--enforce', action='store_true',
+                        help="Re-otimizar com qualidade menor as imagens das páginas acima do orçamento")
+    parser.add_argument('--hashed', action='store_true',
+                        help="Re-otimizar com nomes {stem}-{variante}.{hash}.{ext} (padrão: detectar)")
+    args = parser.parse_args()
+
+    checker = ImageBudgetChecker()
+    within_budget = checker.run(enforce=args.enforce, hashed=args.hashed)
+    raise SystemExit(0 if within_budget else 1)
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+🖼️ HIPERLIGA ON-DEMAND IMAGE SERVER
+Serviço local de redimensionamento sob demanda com cache LRU em disco
+
+Uso:
+    python3 image_server.py --port 8090 --cache-mb 256
+    curl "http://localhost:8090/02_hero/hero-construction-scene.webp?w=768&fmt=avif&q=60"
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+import threading
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs, unquote
+
+from PIL import Image, ImageOps
+
+from optimize_images import ImageOptimizer, IMAGES_DIR, BREAKPOINTS
+
+# Configuração
+CACHE_DIR = Path("../.cache/images")
+DEFAULT_CACHE_MB = 256
+
+# Larguras permitidas: thumbnails (IMAGE_SIZES.thumbnail) + breakpoints do otimizador
+ALLOWED_WIDTHS = sorted({150, 300, 450, *BREAKPOINTS.values()})
+
+# Qualidade arredondada em passos para limitar o número de variantes
+QUALITY_STEP = 5
+QUALITY_RANGE = (30, 95)
+
+CONTENT_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'jpg': 'image/jpeg'
+}
+
+SOURCE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
+
+
+def snap_width(width):
+    """Arredondar largura pedida para o menor valor permitido que a comporte"""
+    for allowed in ALLOWED_WIDTHS:
+        if allowed >= width:
+            return allowed
+    return ALLOWED_WIDTHS[-1]
+
+
+def snap_quality(quality):
+    """Limitar e arredondar qualidade (0-100) para o passo configurado"""
+    quality = max(QUALITY_RANGE[0], min(QUALITY_RANGE[1], quality))
+    return int(round(quality / QUALITY_STEP) * QUALITY_STEP)
+
+
+class DiskLRUCache:
+    """Cache em disco com despejo LRU limitado por bytes"""
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # chave → tamanho (mais antigo primeiro)
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self.load_existing()
+
+    def load_existing(self):
+        """Reconstruir índice a partir dos arquivos já em disco (ordem de acesso)"""
+        files = [path for path in self.cache_dir.iterdir() if path.is_file() and not path.name.startswith('.')]
+        for path in sorted(files, key=lambda p: p.stat().st_mtime):
+            size = path.stat().st_size
+            self.entries[path.name] = size
+            self.total_bytes += size
+        with self.lock:
+            self.evict()
+
+    def get(self, key, record_stats=True):
+        """Retornar bytes em cache (ou None) e marcar como recente"""
+        with self.lock:
+            if key not in self.entries:
+                if record_stats:
+                    self.stats['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+            if record_stats:
+                self.stats['hits'] += 1
+
+        path = self.cache_dir / key
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # Preserva ordem LRU entre reinícios
+            return data
+        except FileNotFoundError:
+            # Despejado entre o lookup e a leitura
+            with self.lock:
+                if key in self.entries:
+                    self.total_bytes -= self.entries.pop(key)
+            return None
+
+    def put(self, key, tmp_path):
+        """Mover arquivo gerado para o cache e despejar até caber no limite"""
+        path = self.cache_dir / key
+        size = Path(tmp_path).stat().st_size
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)
+            self.entries[key] = size
+            self.total_bytes += size
+            self.evict()
+
+        return path
+
+    def evict(self):
+        """Remover entradas menos recentes até total <= max_bytes (requer lock)"""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.stats['evictions'] += 1
+            try:
+                (self.cache_dir / key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                **self.stats
+            }
+
+
+class OnDemandResizer:
+    """Gera variantes sob demanda usando o pipeline do ImageOptimizer"""
+
+    def __init__(self, cache, optimizer):
+        self.cache = cache
+        self.optimizer = optimizer
+        self.inflight = {}  # chave → Future (coalescência de requisições)
+        self.inflight_lock = threading.Lock()
+        self.stats = {'encodes': 0, 'coalesced': 0}
+
+    def resolve_source(self, url_path):
+        """Converter caminho da URL em arquivo dentro de IMAGES_DIR (sem path traversal)"""
+        relative = unquote(url_path).lstrip('/')
+        if relative.startswith('images/'):
+            relative = relative[len('images/'):]
+
+        images_root = IMAGES_DIR.resolve()
+        source = (images_root / relative).resolve()
+        if images_root not in source.parents or not source.is_file():
+            return None
+        if source.suffix.lower() not in SOURCE_EXTENSIONS:
+            return None
+        return source
+
+    def is_animated(self, source):
+        """Verificar se a origem tem mais de um frame (GIF/WebP animado)"""
+        with Image.open(source) as img:
+            return getattr(img, 'is_animated', False)
+
+    def variant_key(self, source, width, fmt, quality):
+        """Chave da variante: muda quando o arquivo de origem é alterado"""
+        stat = source.stat()
+        raw = f"{source}|{stat.st_mtime_ns}|{stat.st_size}|{width}|{fmt}|{quality}"
+        return f"{hashlib.sha1(raw.encode()).hexdigest()}.{fmt}"
+
+    def get_variant(self, source, width, fmt, quality):
+        """Retornar (bytes, status do cache) gerando a variante no máximo uma vez"""
+        with Image.open(source) as img:
+            # Apenas o cabeçalho é lido; orientações EXIF 5-8 trocam largura/altura
+            source_width = img.height if img.getexif().get(0x0112) in (5, 6, 7, 8) else img.width
+        # Nunca aumentar: larguras acima do original geram a mesma variante
+        width = min(width, source_width)
+
+        key = self.variant_key(source, width, fmt, quality)
+
+        data = self.cache.get(key)
+        if data is not None:
+            return data, 'HIT'
+
+        with self.inflight_lock:
+            future = self.inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self.inflight[key] = future
+            else:
+                self.stats['coalesced'] += 1
+
+        if not is_owner:
+            return future.result(), 'COALESCED'
+
+        try:
+            # Outra requisição pode ter concluído entre o lookup e o registro
+            # (o miss desta requisição já foi contado no primeiro lookup)
+            data = self.cache.get(key, record_stats=False) or self.encode(source, key, width, fmt, quality)
+            future.set_result(data)
+            return data, 'MISS'
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.inflight_lock:
+                self.inflight.pop(key, None)
+
+    def encode(self, source, key, width, fmt, quality):
+        """Redimensionar e codificar variante, gravando no cache"""
+        self.stats['encodes'] += 1
+
+        with tempfile.TemporaryDirectory(dir=self.cache.cache_dir) as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+
+            output_path = tmp_dir / key
+            with Image.open(source) as img:
+                animated = getattr(img, 'is_animated', False)
+                if animated:
+                    # Animação preservada como WebP animado (o handler só pede webp aqui)
+                    self.encode_animation(img, output_path, width, quality)
+                else:
+                    img = ImageOps.exif_transpose(img)
+                    img, _ = self.optimizer.normalize_image(img)
+                    if img.width != width:
+                        height = int(img.height * width / img.width)
+                        img = img.resize((width, height), Image.Resampling.LANCZOS)
+
+                    if fmt == 'jpg':
+                        img.convert('RGB').save(output_path, 'JPEG',
+                                                quality=quality or self.optimizer.quality['jpg'],
+                                                optimize=True)
+                    else:
+                        # Intermediário sem perdas para não recomprimir duas vezes
+                        intermediate = tmp_dir / 'source.png'
+                        img.convert('RGBA').save(intermediate, 'PNG')
+
+            if animated:
+                ok = True
+            elif fmt == 'webp':
+                ok = self.optimizer.convert_to_webp(str(intermediate), str(output_path), quality)
+            elif fmt == 'avif':
+                cq_level = None if quality is None else int(round((100 - quality) * 63 / 100))
+                ok = self.optimizer.convert_to_avif(str(intermediate), str(output_path), cq_level)
+            else:
+                ok = True
+
+            if not ok or not output_path.exists():
+                raise RuntimeError(f"Falha ao codificar {fmt}")
+
+            # Lê antes do put: um despejo concorrente pode remover o arquivo do cache
+            data = output_path.read_bytes()
+            self.cache.put(key, output_path)
+
+        return data
+
+    def encode_animation(self, img, output_path, width, quality):
+        """Redimensionar todos os frames e gravar WebP animado (mesmo caminho do otimizador)"""
+        height = max(1, int(img.height * width / img.width))
+        frames, durations, _ = self.optimizer.extract_animation_frames(img, (width, height))
+        frames[0].save(output_path, 'WEBP', save_all=True, append_images=frames[1:],
+                       duration=durations,
+                       loop=self.optimizer.webp_loop(img.info.get('loop'), img.format),
+                       quality=quality or self.optimizer.quality['webp'], method=4)
+
+
+class ImageRequestHandler(BaseHTTPRequestHandler):
+    """Handler HTTP: GET /{path}?w=&fmt=&q="""
+
+    resizer = None  # Definido em create_server
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+
+        if parsed.path == '/__stats':
+            stats = {
+                'cache': self.resizer.cache.snapshot(),
+                **self.resizer.stats
+            }
+            return self.send_body(200, json.dumps(stats).encode(), 'application/json')
+
+        source = self.resizer.resolve_source(parsed.path)
+        if source is None:
+            return self.send_error(404, "Imagem não encontrada")
+
+        params = parse_qs(parsed.query)
+        try:
+            width = snap_width(int(params.get('w', [ALLOWED_WIDTHS[-1]])[0]))
+            quality = params.get('q', [None])[0]
+            quality = snap_quality(int(quality)) if quality is not None else None
+        except ValueError:
+            return self.send_error(400, "Parâmetros w/q devem ser inteiros")
+
+        requested_fmt = params.get('fmt', ['auto'])[0].lower()
+        fmt = 'jpg' if requested_fmt == 'jpeg' else requested_fmt
+        if fmt == 'auto':
+            fmt = self.negotiate_format()
+        if fmt not in CONTENT_TYPES:
+            return self.send_error(400, f"Formato inválido: {fmt}")
+        if fmt == 'avif' and not self.resizer.optimizer.has_avif:
+            fmt = 'webp'
+
+        # Animações: WebP animado (AVIF animado exige ffmpeg; JPG perderia os frames)
+        if self.resizer.is_animated(source):
+            if fmt == 'jpg' and requested_fmt != 'auto':
+                return self.send_error(415, "Imagem animada: use fmt=webp ou fmt=auto")
+            fmt = 'webp'
+
+        started = time.time()
+        try:
+            data, cache_status = self.resizer.get_variant(source, width, fmt, quality)
+        except Exception as e:
+            return self.send_error(500, f"Erro ao gerar variante: {e}")
+
+        self.send_body(200, data, CONTENT_TYPES[fmt], {
+            'Cache-Control': 'public, max-age=86400',
+            'Vary': 'Accept',
+            'X-Cache': cache_status,
+            'Server-Timing': f"resize;dur={(time.time() - started) * 1000:.1f}"
+        })
+
+    def negotiate_format(self):
+        """Escolher o melhor formato suportado pelo cliente (header Accept)"""
+        accept = self.headers.get('Accept', '')
+        if 'image/avif' in accept and self.resizer.optimizer.has_avif:
+            return 'avif'
+        if 'image/webp' in accept:
+            return 'webp'
+        return 'jpg'
+
+    def send_body(self, status, data, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def create_server(host, port, cache_mb, quiet=False):
+    """Montar servidor com cache e otimizador compartilhados"""
+    optimizer = ImageOptimizer()
+    if not optimizer.check_dependencies():
+        raise SystemExit("❌ Dependências não atendidas. Abortando.")
+
+    cache = DiskLRUCache(CACHE_DIR, cache_mb * 1024 * 1024)
+    ImageRequestHandler.resizer = OnDemandResizer(cache, optimizer)
+
+    server = ThreadingHTTPServer((host, port), ImageRequestHandler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local de imagens sob demanda")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_MB,
+                        help="Tamanho máximo do cache em disco (MB)")
+    parser.add_argument('--quiet', action='store_true', help="Não registrar cada requisição")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.cache_mb, args.quiet)
+    print(f"🚀 Servidor de imagens em http://{args.host}:{args.port}")
+    print(f"   📁 Origem: {IMAGES_DIR}")
+    print(f"   💾 Cache: {CACHE_DIR} (máx. {args.cache_mb} MB)")
+    print(f"   📏 Larguras permitidas: {', '.join(map(str, ALLOWED_WIDTHS))}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Encerrando servidor")
+        server.server_close()
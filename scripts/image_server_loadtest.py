@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+📈 HIPERLIGA IMAGE SERVER LOAD TEST
+Gera carga concorrente contra o image_server.py e mede latência/cache
+
+Uso:
+    python3 image_server.py --quiet &
+    python3 image_server_loadtest.py --requests 500 --concurrency 16
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+
+from optimize_images import ImageOptimizer, IMAGES_DIR
+from image_server import SOURCE_EXTENSIONS
+
+# Larguras pedidas propositalmente fora dos valores permitidos (testa o snapping)
+REQUESTED_WIDTHS = [100, 320, 500, 640, 700, 1000, 1440, 2400]
+FORMATS = ['webp', 'avif', 'jpg', 'auto']
+
+
+def find_sources(limit):
+    """Listar imagens originais (sem derivados) para compor as URLs"""
+    optimizer = ImageOptimizer()
+    sources = []
+    for path in sorted(IMAGES_DIR.rglob('*')):
+        if path.suffix.lower() not in SOURCE_EXTENSIONS or optimizer.is_derivative(path):
+            continue
+        sources.append(path.relative_to(IMAGES_DIR).as_posix())
+    return sources[:limit]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor de imagens")
+    parser.add_argument('--url', default='http://127.0.0.1:8090')
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--sources', type=int, default=10, help="Quantidade de imagens distintas")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    sources = find_sources(args.sources)
+    if not sources:
+        raise SystemExit(f"❌ Nenhuma imagem encontrada em {IMAGES_DIR}")
+
+    urls = [
+        f"{args.url}/{random.choice(sources)}"
+        f"?w={random.choice(REQUESTED_WIDTHS)}&fmt={random.choice(FORMATS)}"
+        for _ in range(args.requests)
+    ]
+
+    latencies = []
+    statuses = Counter()
+    cache_status = Counter()
+    total_bytes = 0
+    lock = threading.Lock()
+
+    def fetch(url):
+        nonlocal total_bytes
+        request = Request(url, headers={'Accept': 'image/avif,image/webp,image/*'})
+        started = time.perf_counter()
+        try:
+            with urlopen(request, timeout=120) as response:
+                body = response.read()
+                status = response.status
+                cache = response.headers.get('X-Cache', '-')
+        except HTTPError as e:
+            body, status, cache = b'', e.code, 'ERROR'
+        elapsed = (time.perf_counter() - started) * 1000
+
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] += 1
+            cache_status[cache] += 1
+            total_bytes += len(body)
+
+    print(f"📈 {args.requests} requisições, {args.concurrency} conexões, {len(sources)} imagens")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(fetch, urls))
+    duration = time.perf_counter() - started
+
+    print("\n" + "="*60)
+    print("📊 RESULTADO DO TESTE DE CARGA")
+    print("="*60)
+    print(f"⏱️  Duração: {duration:.2f}s ({args.requests / duration:.1f} req/s)")
+    print(f"📦 Transferido: {total_bytes / 1024 / 1024:.1f} MB")
+    print(f"🎯 Latência p50: {percentile(latencies, 50):.1f}ms | "
+          f"p95: {percentile(latencies, 95):.1f}ms | p99: {percentile(latencies, 99):.1f}ms")
+    print(f"📬 Status: {dict(statuses)}")
+    print(f"💾 Cache: {dict(cache_status)}")
+
+    try:
+        with urlopen(f"{args.url}/__stats", timeout=10) as response:
+            print(f"🧮 Servidor: {json.loads(response.read())}")
+    except Exception as e:
+        print(f"⚠️  Não foi possível ler /__stats: {e}")
+
+
+if __name__ == "__main__":
+    main()
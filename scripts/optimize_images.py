@@ -6,13 +6,27 @@ Otimiza imagens para web moderna com formatos WebP/AVIF
 
 import os
 import json
+import io
+import re
+import math
+import hashlib
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from PIL import Image, ImageOps
+from PIL import Image, ImageCms, ImageOps, ImageSequence
 import subprocess
 import time
 
 # Configuração
 IMAGES_DIR = Path("../public/images")
+CATALOG_FILE = IMAGES_DIR / "image_catalog.json"
+MANIFEST_FILE = IMAGES_DIR / "image_manifest.json"
+# Estado do GC (url → momento em que deixou de ser referenciado); fora do manifesto,
+# que é importado no bundle do frontend
+RETIRED_FILE = IMAGES_DIR / "retired_derivatives.json"
 BREAKPOINTS = {
     'mobile': 640,
     'tablet': 768, 
@@ -26,11 +40,61 @@ QUALITY_SETTINGS = {
     'jpg': 85
 }
 
+# Nomes de derivados: {stem}-{variante}[.{hash}].{ext}
+DERIVATIVE_SUFFIXES = ('optimized', *BREAKPOINTS)
+HASH_LENGTH = 8
+HASHED_STEM_PATTERN = re.compile(rf'\.[0-9a-f]{{{HASH_LENGTH}}}$')
+GC_GRACE_DAYS = 7  # Mantém derivados recentes para HTML ainda em cache de deploys anteriores
+
+# Ordem de processamento: imagens críticas (LCP, header) ficam prontas primeiro
+CATEGORY_PRIORITY = [
+    '02_hero',
+    'hero',  # Fundos LCP usados pelas páginas (src/app/page.tsx, produtos/hiperliga)
+    '01_brand',
+    '03_products',
+    '04_benefits',
+    '06_about',
+    '05_gallery',
+    '07_social',
+    '08_misc'
+]
+
+# Perfil de destino da normalização de cor
+SRGB_PROFILE = ImageCms.createProfile('sRGB')
+
+# Chaves de Image.info com metadados descartados na normalização
+METADATA_KEYS = ('exif', 'icc_profile', 'xmp', 'XML:com.adobe.xmp', 'comment')
+
+# Encoders de vídeo para animações (loop sem áudio)
+VIDEO_SETTINGS = {
+    'mp4': {'codec': 'libx264', 'crf': 28},
+    'webm': {'codec': 'libvpx-vp9', 'crf': 36}
+}
+
+# Categorias de ícones empacotadas em um único sprite sheet
+SPRITE_CATEGORIES = ['07_social']
+SPRITE_NAME = 'sprite'
+SPRITE_PADDING = 2  # Espaço entre ícones (evita sangramento no filtro bilinear)
+# Atributos da raiz <svg> que não se aplicam a <symbol> (geometria/documento)
+SVG_ROOT_SKIP_ATTRIBUTES = {'width', 'height', 'x', 'y', 'viewBox', 'id', 'version', 'baseProfile'}
+SVG_URL_REFERENCE = re.compile(r'url\(\s*([\'"]?)#([^)\'"\s]+)\1\s*\)')
+
 class ImageOptimizer:
-    def __init__(self):
+    def __init__(self, sprites=False, quality=None, normalize=True, workers=1, hashed=False,
+                 gc_grace_days=GC_GRACE_DAYS):
+        self.quality = {**QUALITY_SETTINGS, **(quality or {})}
+        self.normalize = normalize
+        self.hashed = hashed
+        self.gc_grace_days = gc_grace_days
+        self.workers = max(1, workers)
+        self.lock = threading.Lock()
+        self.manifest = None
         self.processed_images = []
+        self.sprites = []
+        self.sprites_enabled = sprites
         self.total_original_size = 0
         self.total_optimized_size = 0
+        self.total_metadata_removed = 0
         
     def check_dependencies(self):
         """Verificar se ferramentas necessárias estão instaladas"""
@@ -53,6 +117,15 @@ class ImageOptimizer:
             print("   ⚠️  avifenc não encontrado. AVIF será ignorado.")
             self.has_avif = False
             
+        # Verificar ffmpeg (opcional, para GIFs animados)
+        try:
+            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
+            print("   ✅ ffmpeg (AVIF/MP4/WebM animados) disponível")
+            self.has_ffmpeg = True
+        except:
+            print("   ⚠️  ffmpeg não encontrado. Animações serão convertidas apenas para WebP.")
+            self.has_ffmpeg = False
+            
         return True
         
     def get_optimal_size(self, original_width, original_height, category):
@@ -84,6 +157,77 @@ class ImageOptimizer:
         
         return new_width, new_height
         
+    def is_derivative(self, path):
+        """Verificar se o arquivo foi gerado pelo otimizador (não é um original)"""
+        path = Path(path)
+        stem = HASHED_STEM_PATTERN.sub('', path.stem)
+        if stem == SPRITE_NAME:
+            return True
+        if any(stem.endswith(f'-{suffix}') for suffix in DERIVATIVE_SUFFIXES):
+            return True
+        return 'optimized' in path.name or 'mobile' in path.name
+
+    def finalize_output(self, path):
+        """No modo --hashed, renomear derivado para {nome}.{hash}.{ext} (hash do conteúdo)"""
+        if not self.hashed:
+            return str(path)
+
+        path = Path(path)
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()[:HASH_LENGTH]
+        hashed_path = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+        os.replace(path, hashed_path)
+        return str(hashed_path)
+
+    def metadata_size(self, img):
+        """Bytes de metadados (EXIF/XMP/ICC/comentários) presentes no arquivo original"""
+        applist = getattr(img, 'applist', None)
+        if applist:
+            # JPEG: todos os segmentos APPn exceto APP0 (JFIF), que é sempre regravado
+            return sum(len(data) for marker, data in applist if marker != 'APP0')
+
+        return sum(
+            len(img.info[key]) for key in METADATA_KEYS
+            if isinstance(img.info.get(key), (bytes, str))
+        )
+
+    def normalize_image(self, img):
+        """Converter para sRGB usando o perfil ICC embutido e descartar metadados"""
+        if not self.normalize:
+            return img, None
+
+        icc_profile = img.info.get('icc_profile')
+        has_alpha = 'A' in img.getbands() or 'transparency' in img.info
+        source_profile = None
+
+        # Transparência por cor-chave (tRNS em RGB/L/P) e LA viram RGBA antes de limpar info
+        if has_alpha and img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        elif img.mode not in ('RGB', 'RGBA', 'CMYK', 'L'):
+            img = img.convert('RGB')
+
+        if icc_profile:
+            try:
+                profile = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+                source_profile = ImageCms.getProfileDescription(profile).strip()
+
+                # Perfis sRGB em RGB já estão corretos: basta remover o ICC
+                if 'srgb' not in source_profile.lower() or img.mode in ('CMYK', 'L'):
+                    img = ImageCms.profileToProfile(
+                        img, profile, SRGB_PROFILE,
+                        renderingIntent=ImageCms.Intent.PERCEPTUAL,
+                        outputMode='RGBA' if img.mode == 'RGBA' else 'RGB'
+                    )
+            except (ImageCms.PyCMSError, OSError, ValueError) as e:
+                print(f"   ⚠️  Perfil ICC ignorado ({e})")
+
+        if img.mode == 'CMYK':
+            # CMYK sem perfil utilizável: conversão ingênua
+            img = img.convert('RGB')
+
+        # Sem ICC/EXIF/XMP: navegadores assumem sRGB
+        img.info = {}
+        return img, source_profile
+
     def create_responsive_versions(self, image_path, output_base):
         """Criar versões responsivas da imagem"""
         versions = {}
@@ -91,8 +235,9 @@ class ImageOptimizer:
         with Image.open(image_path) as img:
             original_width, original_height = img.size
             
-            # Otimizar orientação EXIF
+            # Otimizar orientação EXIF e normalizar cor/metadados
             img = ImageOps.exif_transpose(img)
+            img, _ = self.normalize_image(img)
             
             for breakpoint, max_width in BREAKPOINTS.items():
                 # Skip se imagem já é menor
@@ -110,30 +255,35 @@ class ImageOptimizer:
                 # Salvar versão JPG otimizada
                 jpg_path = f"{output_base}-{breakpoint}.jpg"
                 resized_img.convert('RGB').save(jpg_path, 'JPEG', 
-                                               quality=QUALITY_SETTINGS['jpg'], 
+                                               quality=self.quality['jpg'], 
                                                optimize=True)
-                versions[f'{breakpoint}_jpg'] = jpg_path
                 
                 # Converter para WebP
                 webp_path = f"{output_base}-{breakpoint}.webp"
-                self.convert_to_webp(jpg_path, webp_path)
-                versions[f'{breakpoint}_webp'] = webp_path
+                if self.convert_to_webp(jpg_path, webp_path):
+                    versions[f'{breakpoint}_webp'] = self.finalize_output(webp_path)
                 
                 # Converter para AVIF se disponível
                 if self.has_avif:
                     avif_path = f"{output_base}-{breakpoint}.avif"
-                    self.convert_to_avif(jpg_path, avif_path)
-                    versions[f'{breakpoint}_avif'] = avif_path
+                    if self.convert_to_avif(jpg_path, avif_path):
+                        versions[f'{breakpoint}_avif'] = self.finalize_output(avif_path)
+                
+                # JPG por último: é a entrada do cwebp/avifenc
+                versions[f'{breakpoint}_jpg'] = self.finalize_output(jpg_path)
         
         return versions
         
-    def convert_to_webp(self, input_path, output_path):
+    def convert_to_webp(self, input_path, output_path, quality=None):
         """Converter imagem para WebP"""
+        if quality is None:
+            quality = self.quality['webp']
         try:
             cmd = [
                 'cwebp',
-                f'-q', str(QUALITY_SETTINGS['webp']),
+                f'-q', str(quality),
                 '-m', '6',  # Máximo esforço de compressão
+                *(['-metadata', 'none'] if self.normalize else []),
                 input_path,
                 '-o', output_path
             ]
@@ -150,16 +300,21 @@ class ImageOptimizer:
             print(f"   ❌ Erro ao converter WebP: {e}")
             return False
             
-    def convert_to_avif(self, input_path, output_path):
-        """Converter imagem para AVIF"""
+    def convert_to_avif(self, input_path, output_path, cq_level=None):
+        """Converter imagem para AVIF (cq-level: 0 = melhor, 63 = menor)"""
+        if cq_level is None:
+            cq_level = self.quality['avif']
         try:
             cmd = [
                 'avifenc',
                 '--min', '0',
                 '--max', '63',
                 '-a', 'end-usage=q',
-                '-a', f'cq-level={QUALITY_SETTINGS["avif"]}',
+                '-a', f'cq-level={cq_level}',
                 '-a', 'tune=ssim',
+                # Sem EXIF/XMP/ICC; apenas a tag CICP mínima de sRGB (BT.709/sRGB/BT.601)
+                *(['--ignore-exif', '--ignore-xmp', '--ignore-icc', '--cicp', '1/13/6']
+                  if self.normalize else []),
                 input_path,
                 output_path
             ]
@@ -176,17 +331,221 @@ class ImageOptimizer:
             print(f"   ❌ Erro ao converter AVIF: {e}")
             return False
             
+    def extract_animation_frames(self, img, target_size):
+        """Extrair frames redimensionados, mesclando frames idênticos consecutivos"""
+        frames = []
+        durations = []
+        icc_profile = img.info.get('icc_profile')
+        resized_cache = {}  # digest → frame redimensionado (evita redimensionar repetidos)
+        previous_digest = None
+        total_frames = 0
+
+        for frame in ImageSequence.Iterator(img):
+            total_frames += 1
+            duration = frame.info.get('duration', 100) or 100
+            rgba = frame.convert('RGBA')
+            if icc_profile:
+                rgba.info['icc_profile'] = icc_profile
+            rgba, _ = self.normalize_image(rgba)
+            digest = hashlib.md5(rgba.tobytes()).hexdigest()
+
+            # Frame idêntico ao anterior: apenas estende a duração
+            if digest == previous_digest:
+                durations[-1] += duration
+                continue
+
+            if digest not in resized_cache:
+                if rgba.size != target_size:
+                    rgba = rgba.resize(target_size, Image.Resampling.LANCZOS)
+                resized_cache[digest] = rgba
+
+            frames.append(resized_cache[digest])
+            durations.append(duration)
+            previous_digest = digest
+
+        return frames, durations, total_frames
+
+    def encode_animation_ffmpeg(self, frames, durations, output_path, codec_args):
+        """Codificar sequência de frames com ffmpeg (concat com duração por frame)"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+            concat_lines = []
+
+            for i, (frame, duration) in enumerate(zip(frames, durations)):
+                frame_path = tmp_dir / f"frame_{i:05d}.png"
+                # Vídeo não suporta transparência: achatar sobre fundo branco
+                background = Image.new('RGBA', frame.size, (255, 255, 255, 255))
+                Image.alpha_composite(background, frame).convert('RGB').save(frame_path, 'PNG')
+                concat_lines.append(f"file '{frame_path.name}'")
+                concat_lines.append(f"duration {duration / 1000:.3f}")
+
+            # O demuxer concat ignora a duração do último frame sem repetição
+            concat_lines.append(f"file 'frame_{len(frames) - 1:05d}.png'")
+
+            concat_path = tmp_dir / "frames.txt"
+            concat_path.write_text("\n".join(concat_lines) + "\n")
+
+            cmd = [
+                'ffmpeg', '-y', '-loglevel', 'error',
+                '-f', 'concat', '-safe', '0', '-i', str(concat_path),
+                '-an',
+                # Codecs 4:2:0 exigem dimensões pares
+                '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                '-pix_fmt', 'yuv420p',
+                *codec_args,
+                str(output_path)
+            ]
+
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True)
+                if result.returncode == 0:
+                    return True
+                print(f"   ❌ Erro ffmpeg ({Path(output_path).suffix}): {result.stderr.strip()}")
+                return False
+            except Exception as e:
+                print(f"   ❌ Erro ao executar ffmpeg: {e}")
+                return False
+
+    def webp_loop(self, loop, source_format):
+        """Converter loop da origem para o WebP (nº de exibições, 0 = infinito)
+
+        O Pillow assume 0 quando loop é omitido; no GIF, loop=N repete N vezes
+        após a primeira e a ausência de loop significa tocar uma vez.
+        """
+        if loop is None:
+            return 1
+        if loop == 0 or source_format == 'WEBP':
+            return loop
+        return loop + 1
+
+    def optimize_animated_image(self, image_path, category):
+        """Otimizar imagem animada (GIF/WebP) preservando a animação"""
+        print(f"🎞️  Animação detectada: {image_path.name}")
+
+        original_size = image_path.stat().st_size
+        output_base = image_path.parent / image_path.stem
+
+        with Image.open(image_path) as img:
+            original_width, original_height = img.size
+            # GIF sem extensão NETSCAPE não tem 'loop' e toca uma única vez
+            loop = img.info.get('loop')
+            source_format = img.format
+            metadata_removed = self.metadata_size(img) if self.normalize else 0
+            optimal_width, optimal_height = self.get_optimal_size(
+                original_width, original_height, category
+            )
+            frames, durations, total_frames = self.extract_animation_frames(
+                img, (optimal_width, optimal_height)
+            )
+
+        print(f"   🎬 {total_frames} frames → {len(frames)} únicos, "
+              f"{original_width}x{original_height} → {optimal_width}x{optimal_height}")
+
+        outputs = {}
+
+        # Primeiro frame como fallback estático / poster de vídeo
+        poster_jpg = f"{output_base}-optimized.jpg"
+        background = Image.new('RGBA', frames[0].size, (255, 255, 255, 255))
+        Image.alpha_composite(background, frames[0]).convert('RGB').save(
+            poster_jpg, 'JPEG', quality=self.quality['jpg'], optimize=True
+        )
+
+        # WebP animado (mantém transparência)
+        webp_path = f"{output_base}-optimized.webp"
+        try:
+            frames[0].save(webp_path, 'WEBP', save_all=True, append_images=frames[1:],
+                           duration=durations, loop=self.webp_loop(loop, source_format),
+                           quality=self.quality['webp'], method=6)
+            outputs['webp'] = webp_path
+        except Exception as e:
+            print(f"   ❌ Erro WebP animado: {e}")
+
+        if self.has_ffmpeg:
+            encoders = {
+                'avif': [
+                    '-c:v', 'libaom-av1', '-crf', str(self.quality['avif']),
+                    '-b:v', '0', '-cpu-used', '6', '-f', 'avif'
+                ],
+                'mp4': [
+                    '-c:v', VIDEO_SETTINGS['mp4']['codec'], '-crf', str(VIDEO_SETTINGS['mp4']['crf']),
+                    '-preset', 'slow', '-movflags', '+faststart'
+                ],
+                'webm': [
+                    '-c:v', VIDEO_SETTINGS['webm']['codec'], '-crf', str(VIDEO_SETTINGS['webm']['crf']),
+                    '-b:v', '0'
+                ]
+            }
+            for fmt, codec_args in encoders.items():
+                output_path = f"{output_base}-optimized.{fmt}"
+                if self.encode_animation_ffmpeg(frames, durations, output_path, codec_args):
+                    outputs[fmt] = output_path
+
+        poster_jpg = self.finalize_output(poster_jpg)
+        outputs = {fmt: self.finalize_output(output_path) for fmt, output_path in outputs.items()}
+
+        # Comparar tamanhos com o original
+        animated_outputs = {}
+        for fmt, output_path in outputs.items():
+            size = Path(output_path).stat().st_size
+            delta = ((original_size - size) / original_size) * 100
+            animated_outputs[fmt] = {'path': output_path, 'size': size, 'savings_percent': delta}
+            print(f"   📦 {fmt.upper():4} {size/1024:.1f}KB ({delta:+.1f}% economia)")
+
+        if animated_outputs:
+            best_format = min(animated_outputs, key=lambda fmt: animated_outputs[fmt]['size'])
+            optimized_size = animated_outputs[best_format]['size']
+        else:
+            best_format = None
+            optimized_size = original_size
+
+        savings = ((original_size - optimized_size) / original_size) * 100
+
+        result = {
+            'original_path': str(image_path),
+            'category': category,
+            'original_size': original_size,
+            'optimized_size': optimized_size,
+            'savings_percent': savings,
+            'original_dimensions': f"{original_width}x{original_height}",
+            'optimized_dimensions': f"{optimal_width}x{optimal_height}",
+            'webp_created': 'webp' in outputs,
+            'avif_created': 'avif' in outputs,
+            'optimized_versions': {'jpg': poster_jpg},
+            'responsive_versions': {},
+            'animated': True,
+            'frames': total_frames,
+            'unique_frames': len(frames),
+            'loop': loop,  # None = toca uma vez (vídeo sem atributo loop)
+            'animated_outputs': animated_outputs,
+            'best_format': best_format,
+            'quality': dict(self.quality),
+            'metadata_bytes_removed': metadata_removed
+        }
+
+        self.record_result(result)
+
+        print(f"   ✅ Melhor formato: {best_format or 'nenhum'} — Economia: {savings:.1f}% "
+              f"({original_size/1024:.1f}KB → {optimized_size/1024:.1f}KB)")
+
+        return True
+
     def optimize_single_image(self, image_path, category):
         """Otimizar uma imagem específica"""
         print(f"🎨 Otimizando: {image_path.name}")
         
         try:
+            # Animações seguem caminho próprio (convert('RGB') manteria só o 1º frame)
+            with Image.open(image_path) as img:
+                is_animated = getattr(img, 'is_animated', False)
+            if is_animated:
+                return self.optimize_animated_image(image_path, category)
+
             # Informações originais
             original_size = image_path.stat().st_size
-            self.total_original_size += original_size
             
             with Image.open(image_path) as img:
                 original_width, original_height = img.size
+                metadata_removed = self.metadata_size(img) if self.normalize else 0
                 
             # Determinar tamanho otimizado
             optimal_width, optimal_height = self.get_optimal_size(
@@ -201,8 +560,9 @@ class ImageOptimizer:
                 print(f"   📏 Redimensionando: {original_width}x{original_height} → {optimal_width}x{optimal_height}")
                 
                 with Image.open(image_path) as img:
-                    # Otimizar orientação EXIF
+                    # Otimizar orientação EXIF e normalizar cor/metadados
                     img = ImageOps.exif_transpose(img)
+                    img, source_profile = self.normalize_image(img)
                     
                     # Redimensionar
                     resized_img = img.resize((optimal_width, optimal_height), Image.Resampling.LANCZOS)
@@ -210,15 +570,16 @@ class ImageOptimizer:
                     # Salvar JPG otimizado
                     optimized_jpg = f"{output_base}-optimized.jpg"
                     resized_img.convert('RGB').save(optimized_jpg, 'JPEG',
-                                                   quality=QUALITY_SETTINGS['jpg'],
+                                                   quality=self.quality['jpg'],
                                                    optimize=True)
             else:
                 # Apenas otimizar sem redimensionar
                 optimized_jpg = f"{output_base}-optimized.jpg"
                 with Image.open(image_path) as img:
                     img = ImageOps.exif_transpose(img)
+                    img, source_profile = self.normalize_image(img)
                     img.convert('RGB').save(optimized_jpg, 'JPEG',
-                                          quality=QUALITY_SETTINGS['jpg'],
+                                          quality=self.quality['jpg'],
                                           optimize=True)
             
             # Converter para WebP
@@ -236,7 +597,15 @@ class ImageOptimizer:
             
             # Calcular economia de espaço
             optimized_size = Path(optimized_jpg).stat().st_size if Path(optimized_jpg).exists() else original_size
-            self.total_optimized_size += optimized_size
+            
+            # Versões finais (com hash de conteúdo no modo --hashed)
+            optimized_versions = {}
+            if avif_success:
+                optimized_versions['avif'] = self.finalize_output(optimized_avif)
+            if webp_success:
+                optimized_versions['webp'] = self.finalize_output(optimized_webp)
+            if Path(optimized_jpg).exists():
+                optimized_versions['jpg'] = self.finalize_output(optimized_jpg)
             
             savings = ((original_size - optimized_size) / original_size) * 100
             
@@ -251,10 +620,18 @@ class ImageOptimizer:
                 'optimized_dimensions': f"{optimal_width}x{optimal_height}",
                 'webp_created': webp_success,
                 'avif_created': avif_success,
-                'responsive_versions': responsive_versions
+                'optimized_versions': optimized_versions,
+                'responsive_versions': responsive_versions,
+                'quality': dict(self.quality),
+                'metadata_bytes_removed': metadata_removed,
+                'source_color_profile': source_profile
             }
             
-            self.processed_images.append(result)
+            self.record_result(result)
+            
+            if metadata_removed or source_profile:
+                print(f"   🧹 Metadados removidos: {metadata_removed/1024:.1f}KB"
+                      + (f" (perfil ICC de origem: '{source_profile}')" if source_profile else ""))
             
             print(f"   ✅ Economia: {savings:.1f}% ({original_size/1024:.1f}KB → {optimized_size/1024:.1f}KB)")
             
@@ -264,6 +641,244 @@ class ImageOptimizer:
             print(f"   ❌ Erro ao otimizar {image_path}: {e}")
             return False
             
+    def pack_sprite(self, icons):
+        """Empacotar ícones em prateleiras (shelf packing) e retornar coordenadas"""
+        # Largura alvo: lado de um quadrado com a área total dos ícones
+        total_area = sum((img.width + SPRITE_PADDING) * (img.height + SPRITE_PADDING) for _, img in icons)
+        widest = max(img.width for _, img in icons)
+        sheet_width = max(widest, int(math.ceil(math.sqrt(total_area))))
+
+        positions = {}
+        x, y, shelf_height = 0, 0, 0
+        for name, img in sorted(icons, key=lambda item: item[1].height, reverse=True):
+            if x + img.width > sheet_width:
+                x = 0
+                y += shelf_height + SPRITE_PADDING
+                shelf_height = 0
+            positions[name] = {'x': x, 'y': y, 'width': img.width, 'height': img.height}
+            x += img.width + SPRITE_PADDING
+            shelf_height = max(shelf_height, img.height)
+
+        sheet_height = y + shelf_height
+        used_width = max(pos['x'] + pos['width'] for pos in positions.values())
+        return positions, used_width, sheet_height
+
+    def sprite_icon_key(self, folder, icon_path):
+        """Chave do ícone a partir do caminho relativo, válida como identificador CSS"""
+        relative = icon_path.relative_to(folder).with_suffix('').as_posix()
+        key = re.sub(r'[^a-z0-9_-]+', '-', relative.lower()).strip('-')
+        return key or 'icon'
+
+    def namespace_svg_ids(self, element, prefix):
+        """Prefixar ids internos (gradientes, clipPaths...) e suas referências url(#)/href"""
+        ids = {node.get('id') for node in element.iter() if node.get('id')}
+        if not ids:
+            return
+
+        def rename_url(match):
+            target = match.group(2)
+            if target not in ids:
+                return match.group(0)
+            return f"url({match.group(1)}#{prefix}-{target}{match.group(1)})"
+
+        for node in element.iter():
+            for name, value in node.attrib.items():
+                if name == 'id':
+                    node.set(name, f"{prefix}-{value}")
+                elif name.endswith('href') and value.startswith('#') and value[1:] in ids:
+                    node.set(name, f"#{prefix}-{value[1:]}")
+                elif 'url(' in value:
+                    node.set(name, SVG_URL_REFERENCE.sub(rename_url, value))
+            if node.text and 'url(' in node.text:
+                node.text = SVG_URL_REFERENCE.sub(rename_url, node.text)
+
+    def generate_svg_symbol_sheet(self, svg_files, category, output_path):
+        """Combinar ícones SVG em uma folha de <symbol> para uso com <use href>"""
+        svg_ns = 'http://www.w3.org/2000/svg'
+        ET.register_namespace('', svg_ns)
+        ET.register_namespace('xlink', 'http://www.w3.org/1999/xlink')
+
+        sheet = ET.Element(f'{{{svg_ns}}}svg', {'style': 'display:none'})
+        symbols = []
+        folder = IMAGES_DIR / category
+
+        for svg_path in svg_files:
+            try:
+                root = ET.parse(svg_path).getroot()
+            except ET.ParseError as e:
+                print(f"   ⚠️  SVG inválido ignorado ({svg_path.name}): {e}")
+                continue
+
+            view_box = root.get('viewBox')
+            if not view_box and root.get('width') and root.get('height'):
+                width = root.get('width').replace('px', '')
+                height = root.get('height').replace('px', '')
+                view_box = f"0 0 {width} {height}"
+
+            # IDs XML não podem começar com dígito (07_social-...)
+            symbol_id = f"icon-{category}-{self.sprite_icon_key(folder, svg_path)}"
+            if symbol_id in symbols:
+                print(f"   ⚠️  SVG ignorado: {svg_path.relative_to(folder)} repete o id '{symbol_id}'")
+                continue
+            self.namespace_svg_ids(root, symbol_id)
+            symbol = ET.SubElement(sheet, f'{{{svg_ns}}}symbol', {'id': symbol_id})
+            if view_box:
+                symbol.set('viewBox', view_box)
+            # fill/stroke/stroke-width da raiz valem para o ícone inteiro (ex.: Lucide/Feather)
+            for name, value in root.attrib.items():
+                if name not in SVG_ROOT_SKIP_ATTRIBUTES:
+                    symbol.set(name, value)
+            for child in list(root):
+                symbol.append(child)
+            symbols.append(symbol_id)
+
+        if symbols:
+            ET.ElementTree(sheet).write(output_path, encoding='unicode')
+        return symbols
+
+    def public_url(self, path):
+        """Converter caminho local em URL pública (/images/...)"""
+        return '/' + Path(path).relative_to(IMAGES_DIR.parent).as_posix()
+
+    def generate_sprite_sheet(self, category):
+        """Gerar sprite sheet (raster + SVG opcional) com coordenadas em JSON/CSS"""
+        folder = IMAGES_DIR / category
+        if not folder.is_dir():
+            print(f"   ⏭️  Categoria sem pasta: {category}")
+            return None
+
+        print(f"🧩 Gerando sprite sheet: {category}")
+
+        raster_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
+        icons = []
+        icon_sources = {}  # chave → arquivo (detecta colisões como facebook.png/facebook.webp)
+        original_size = 0
+
+        for icon_path in sorted(folder.rglob('*')):
+            if icon_path.suffix.lower() not in raster_extensions or self.is_derivative(icon_path):
+                continue
+
+            key = self.sprite_icon_key(folder, icon_path)
+            if key in icon_sources:
+                print(f"   ⚠️  Ícone ignorado: {icon_path.relative_to(folder)} usa a mesma chave "
+                      f"'{key}' que {icon_sources[key].relative_to(folder)}")
+                continue
+            icon_sources[key] = icon_path
+
+            with Image.open(icon_path) as img:
+                img, _ = self.normalize_image(ImageOps.exif_transpose(img))
+                img = img.convert('RGBA')
+                width, height = self.get_optimal_size(img.width, img.height, category)
+                if (width, height) != img.size:
+                    img = img.resize((width, height), Image.Resampling.LANCZOS)
+                icons.append((key, img))
+            original_size += icon_path.stat().st_size
+
+        svg_files = [
+            path for path in sorted(folder.rglob('*.svg'))
+            if not self.is_derivative(path)
+        ]
+
+        if not icons and not svg_files:
+            print("   ⏭️  Nenhum ícone encontrado")
+            return None
+
+        slug = category.replace('/', '-').replace('_', '-')
+        sprite = {
+            'category': category,
+            'css_class': f"sprite-{slug}",
+            'icons': {},
+            'original_size': original_size
+        }
+
+        if icons:
+            positions, sheet_width, sheet_height = self.pack_sprite(icons)
+            sheet = Image.new('RGBA', (sheet_width, sheet_height), (0, 0, 0, 0))
+            for name, img in icons:
+                pos = positions[name]
+                sheet.paste(img, (pos['x'], pos['y']))
+
+            png_path = folder / f"{SPRITE_NAME}.png"
+            sheet.save(png_path, 'PNG', optimize=True)
+            sheet_files = {}
+
+            webp_path = folder / f"{SPRITE_NAME}.webp"
+            if self.convert_to_webp(str(png_path), str(webp_path)):
+                sheet_files['webp'] = self.public_url(self.finalize_output(webp_path))
+
+            if self.has_avif:
+                avif_path = folder / f"{SPRITE_NAME}.avif"
+                if self.convert_to_avif(str(png_path), str(avif_path)):
+                    sheet_files['avif'] = self.public_url(self.finalize_output(avif_path))
+
+            # PNG por último: é a entrada do cwebp/avifenc
+            sheet_files['png'] = self.public_url(self.finalize_output(png_path))
+
+            sprite['sheet'] = {'width': sheet_width, 'height': sheet_height, **sheet_files}
+            sprite['icons'] = positions
+            sprite['sprite_size'] = min(
+                (folder / Path(url).name).stat().st_size for url in sheet_files.values()
+            )
+
+            css_path = folder / f"{SPRITE_NAME}.css"
+            css_path.write_text(self.generate_sprite_css(sprite), encoding='utf-8')
+            sprite['css'] = self.public_url(self.finalize_output(css_path))
+
+            print(f"   ✅ {len(icons)} ícones → {sheet_width}x{sheet_height} "
+                  f"({original_size/1024:.1f}KB → {sprite['sprite_size']/1024:.1f}KB, 1 requisição)")
+
+        if svg_files:
+            svg_path = folder / f"{SPRITE_NAME}.svg"
+            symbols = self.generate_svg_symbol_sheet(svg_files, category, svg_path)
+            if symbols:
+                sprite['svg'] = self.public_url(self.finalize_output(svg_path))
+                sprite['symbols'] = symbols
+                print(f"   ✅ {len(symbols)} símbolos SVG → {Path(sprite['svg']).name}")
+
+        manifest_path = folder / f"{SPRITE_NAME}.json"
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(sprite, f, indent=2, ensure_ascii=False)
+
+        with self.lock:
+            self.sprites.append(sprite)
+            self.publish_sprite(sprite)
+        return sprite
+
+    def generate_sprite_css(self, sprite):
+        """Gerar CSS com background-position de cada ícone do sprite"""
+        sheet = sprite['sheet']
+        base_class = sprite['css_class']
+
+        image_set = []
+        if 'avif' in sheet:
+            image_set.append(f'url("{sheet["avif"]}") type("image/avif")')
+        if 'webp' in sheet:
+            image_set.append(f'url("{sheet["webp"]}") type("image/webp")')
+        image_set.append(f'url("{sheet["png"]}") type("image/png")')
+
+        lines = [
+            f"/* Sprite gerado automaticamente: {sprite['category']} */",
+            f".{base_class} {{",
+            "  display: inline-block;",
+            "  background-repeat: no-repeat;",
+            f'  background-image: url("{sheet["png"]}");',
+            f"  background-image: image-set({', '.join(image_set)});",
+            f"  background-size: {sheet['width']}px {sheet['height']}px;",
+            "}",
+        ]
+
+        for name, pos in sorted(sprite['icons'].items()):
+            lines.extend([
+                "",
+                f".{base_class}-{name} {{",
+                f"  width: {pos['width']}px;",
+                f"  height: {pos['height']}px;",
+                f"  background-position: {-pos['x']}px {-pos['y']}px;",
+                "}",
+            ])
+
+        return "\n".join(lines) + "\n"
+
     def generate_next_config(self):
         """Gerar configuração Next.js otimizada"""
         config = """
@@ -298,6 +913,25 @@ const nextConfig = {
           },
         ],
       },
+      // Manifestos mudam a cada otimização: sempre revalidar
+      {
+        source: '/images/image_manifest.json',
+        headers: [
+          {
+            key: 'Cache-Control',
+            value: 'public, max-age=0, must-revalidate',
+          },
+        ],
+      },
+      {
+        source: '/images/:category/sprite.json',
+        headers: [
+          {
+            key: 'Cache-Control',
+            value: 'public, max-age=0, must-revalidate',
+          },
+        ],
+      },
     ]
   },
 }
@@ -323,6 +957,7 @@ import Image, { ImageProps } from 'next/image'
 import { cn } from '@/lib/utils'
 import { useState } from 'react'
 import { Loading } from '@/components/ui/loading'
+import { resolveImageSrc } from '@/lib/image-manifest'
 
 interface OptimizedImageProps extends Omit<ImageProps, 'src' | 'alt'> {
   src: string
@@ -344,6 +979,9 @@ export function OptimizedImage({
   const [isLoading, setIsLoading] = useState(true)
   const [hasError, setHasError] = useState(false)
 
+  // Resolve to the current derivative (hashed names) from the build-time manifest
+  const resolvedSrc = resolveImageSrc(src)
+
   // Determine responsive sizes based on category
   const getSizes = () => {
     switch (category) {
@@ -382,7 +1020,7 @@ export function OptimizedImage({
       )}
       
       <Image
-        src={src}
+        src={resolvedSrc}
         alt={alt}
         className={cn(
           'transition-opacity duration-300',
@@ -412,6 +1050,221 @@ export function OptimizedImage({
             
         print(f"🧩 Template OptimizedImage criado: {template_path}")
         
+    def record_result(self, result):
+        """Registrar resultado e publicar no manifesto assim que a imagem termina"""
+        with self.lock:
+            self.processed_images.append(result)
+            self.total_original_size += result['original_size']
+            self.total_optimized_size += result['optimized_size']
+            self.total_metadata_removed += result.get('metadata_bytes_removed', 0)
+            self.publish_image(result)
+
+    def load_manifest(self):
+        """Carregar manifesto existente (entradas antigas seguem válidas até serem substituídas)"""
+        if MANIFEST_FILE.exists():
+            with open(MANIFEST_FILE, encoding='utf-8') as f:
+                manifest = json.load(f)
+        else:
+            manifest = {}
+        manifest.setdefault('images', {})
+        manifest.setdefault('sprites', {})
+        return manifest
+
+    def write_manifest(self):
+        """Gravar manifesto de forma atômica (leitores nunca veem JSON parcial) — requer lock"""
+        if self.manifest is None:
+            self.manifest = self.load_manifest()
+        self.manifest['updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
+
+        tmp_path = MANIFEST_FILE.with_name(f".{MANIFEST_FILE.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, MANIFEST_FILE)
+
+    def manifest_entry(self, result):
+        """Montar entrada do manifesto apenas com derivados que existem em disco"""
+        width, height = (int(value) for value in result['optimized_dimensions'].split('x'))
+
+        def existing(paths):
+            return {fmt: self.public_url(path) for fmt, path in paths.items() if Path(path).exists()}
+
+        entry = {
+            'category': result['category'],
+            'width': width,
+            'height': height,
+            'optimized': existing(result.get('optimized_versions', {}))
+        }
+
+        responsive = {}
+        for key, path in result.get('responsive_versions', {}).items():
+            breakpoint, fmt = key.rsplit('_', 1)
+            if Path(path).exists():
+                responsive.setdefault(breakpoint, {})[fmt] = self.public_url(path)
+        if responsive:
+            entry['responsive'] = responsive
+
+        if result.get('animated'):
+            entry['animated'] = existing({
+                fmt: output['path'] for fmt, output in result.get('animated_outputs', {}).items()
+            })
+            entry['best_format'] = result.get('best_format')
+            entry['loop'] = result.get('loop')
+
+        return entry
+
+    def publish_image(self, result):
+        """Adicionar/atualizar entrada de uma imagem no manifesto — requer lock"""
+        if self.manifest is None:
+            self.manifest = self.load_manifest()
+        self.manifest['images'][self.public_url(result['original_path'])] = self.manifest_entry(result)
+        self.write_manifest()
+
+    def publish_sprite(self, sprite):
+        """Adicionar/atualizar sprite sheet no manifesto — requer lock"""
+        if self.manifest is None:
+            self.manifest = self.load_manifest()
+        self.manifest['sprites'][sprite['category']] = {
+            key: sprite[key] for key in ('sheet', 'icons', 'css', 'css_class', 'svg', 'symbols')
+            if key in sprite
+        }
+        self.write_manifest()
+
+    def load_page_references(self):
+        """Contar páginas distintas que referenciam cada imagem (image_catalog.json)"""
+        if not CATALOG_FILE.exists():
+            return {}
+
+        with open(CATALOG_FILE, encoding='utf-8') as f:
+            catalog = json.load(f)
+
+        pages = {}
+        for image in catalog.get('images', []):
+            key = Path(image['local_path']).resolve()
+            pages.setdefault(key, set()).add(image.get('page'))
+        return {path: len(refs) for path, refs in pages.items()}
+
+    def prioritize(self, images):
+        """Ordenar fila: categoria crítica primeiro, depois mais páginas referenciando"""
+        references = self.load_page_references()
+
+        def priority(item):
+            img_path, category = item
+            rank = (CATEGORY_PRIORITY.index(category)
+                    if category in CATEGORY_PRIORITY else len(CATEGORY_PRIORITY))
+            return (rank, -references.get(img_path.resolve(), 0), str(img_path))
+
+        return sorted(images, key=priority)
+
+    def process_queue(self, images):
+        """Processar imagens em ordem de prioridade com N workers; retorna sucessos"""
+        def process(args):
+            i, (img_path, category) = args
+            print(f"\n[{i}/{len(images)}] Processando {category}/{img_path.name}")
+            return self.optimize_single_image(img_path, category)
+
+        # O executor despacha na ordem de submissão (FIFO) = ordem de prioridade
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(process, enumerate(images, 1))
+            return sum(1 for success in results if success)
+
+    def load_retired(self):
+        """Carregar derivados aposentados (url → timestamp)"""
+        if RETIRED_FILE.exists():
+            with open(RETIRED_FILE, encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def save_retired(self, retired):
+        """Gravar derivados aposentados de forma atômica"""
+        tmp_path = RETIRED_FILE.with_name(f".{RETIRED_FILE.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(retired, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, RETIRED_FILE)
+
+    def manifest_urls(self, value):
+        """Todas as URLs /images/... referenciadas em um trecho do manifesto"""
+        urls = set()
+        pending = [value]
+        while pending:
+            value = pending.pop()
+            if isinstance(value, dict):
+                pending.extend(value.values())
+            elif isinstance(value, list):
+                pending.extend(value)
+            elif isinstance(value, str) and value.startswith('/images/'):
+                urls.add(value)
+        return urls
+
+    def derivative_base_url(self, path):
+        """URL do original sem extensão a partir de um derivado ({stem}-{variante}[.{hash}].{ext})"""
+        path = Path(path)
+        stem = HASHED_STEM_PATTERN.sub('', path.stem)
+        for suffix in DERIVATIVE_SUFFIXES:
+            if stem.endswith(f'-{suffix}'):
+                stem = stem[:-len(suffix) - 1]
+                break
+        return self.public_url(path.with_name(stem))
+
+    def collect_garbage(self, grace_days=GC_GRACE_DAYS):
+        """Remover derivados que deixaram de ser referenciados há mais de grace_days"""
+        print("\n🧹 COLETANDO DERIVADOS NÃO REFERENCIADOS")
+
+        with self.lock:
+            if self.manifest is None:
+                self.manifest = self.load_manifest()
+            images = self.manifest['images']
+
+            # Originais já publicados com hash: os nomes estáveis antigos ({stem}-optimized.webp...)
+            # nunca mais são reescritos e também entram na coleta (migração única)
+            hashed_bases = {
+                url.rsplit('.', 1)[0] for url, entry in images.items()
+                if any(HASHED_STEM_PATTERN.search(Path(value).stem) for value in self.manifest_urls(entry))
+            }
+
+            # Originais removidos: a entrada sai do manifesto e seus derivados viram lixo
+            for url in list(images):
+                if not (IMAGES_DIR.parent / url.lstrip('/')).exists():
+                    del images[url]
+            # Manifestos antigos guardavam 'retired' junto (e iam para o bundle)
+            legacy_retired = self.manifest.pop('retired', {})
+            self.write_manifest()
+            referenced = self.manifest_urls(self.manifest) | set(images)
+
+        # A carência conta a partir de quando o derivado deixou de ser referenciado
+        # (mtime não serve: um arquivo antigo acabou de sair do manifesto)
+        retired = {**legacy_retired, **self.load_retired()}
+        now = time.time()
+        removed_count, removed_bytes, kept_recent = 0, 0, 0
+
+        for path in IMAGES_DIR.rglob('*'):
+            if not path.is_file() or not self.is_derivative(path):
+                continue
+            url = self.public_url(path)
+            if url in referenced:
+                continue
+            if (not HASHED_STEM_PATTERN.search(path.stem)
+                    and self.derivative_base_url(path) not in hashed_bases):
+                continue
+
+            retired_at = retired.setdefault(url, now)
+            if now - retired_at < grace_days * 24 * 60 * 60:
+                kept_recent += 1
+                continue
+
+            removed_bytes += path.stat().st_size
+            path.unlink()
+            removed_count += 1
+
+        # Referenciado de novo ou já apagado: sai da lista de aposentados
+        for url in list(retired):
+            if url in referenced or not (IMAGES_DIR.parent / url.lstrip('/')).exists():
+                del retired[url]
+        self.save_retired(retired)
+
+        print(f"   🗑️  {removed_count} derivados removidos ({removed_bytes/1024/1024:.1f} MB)")
+        if kept_recent:
+            print(f"   ⏳ {kept_recent} não referenciados mantidos (< {grace_days} dias)")
+
     def save_optimization_report(self):
         """Salvar relatório de otimização"""
         report = {
@@ -421,9 +1274,11 @@ export function OptimizedImage({
                 'total_optimized_size_mb': self.total_optimized_size / 1024 / 1024,
                 'total_savings_mb': (self.total_original_size - self.total_optimized_size) / 1024 / 1024,
                 'total_savings_percent': ((self.total_original_size - self.total_optimized_size) / self.total_original_size) * 100,
+                'total_metadata_removed_kb': self.total_metadata_removed / 1024,
                 'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
             },
-            'images': self.processed_images
+            'images': self.processed_images,
+            'sprites': self.sprites
         }
         
         report_path = IMAGES_DIR / "optimization_report.json"
@@ -450,20 +1305,31 @@ export function OptimizedImage({
             if folder.is_dir() and not folder.name.startswith('.'):
                 for img_path in folder.rglob('*'):
                     if img_path.suffix.lower() in image_extensions:
-                        # Skip imagens já otimizadas
-                        if 'optimized' not in img_path.name and 'mobile' not in img_path.name:
-                            all_images.append((img_path, folder.name))
+                        # Skip imagens já otimizadas e sprites gerados
+                        if self.is_derivative(img_path):
+                            continue
+                        # Ícones empacotados no sprite não geram arquivos individuais
+                        if self.sprites_enabled and folder.name in SPRITE_CATEGORIES:
+                            continue
+                        all_images.append((img_path, folder.name))
         
         print(f"🖼️  Encontradas {len(all_images)} imagens para otimizar")
         
-        # Otimizar cada imagem
-        success_count = 0
-        for i, (img_path, category) in enumerate(all_images, 1):
-            print(f"\\n[{i}/{len(all_images)}] Processando {category}/{img_path.name}")
-            
-            if self.optimize_single_image(img_path, category):
-                success_count += 1
+        # Críticas primeiro; cada imagem é publicada no manifesto ao terminar
+        all_images = self.prioritize(all_images)
+        print(f"📋 Manifesto publicado incrementalmente em: {MANIFEST_FILE}")
+        success_count = self.process_queue(all_images)
         
+        # Gerar sprite sheets das categorias de ícones
+        if self.sprites_enabled:
+            print("\n🧩 GERANDO SPRITE SHEETS")
+            for category in SPRITE_CATEGORIES:
+                self.generate_sprite_sheet(category)
+
+        # Remover derivados antigos (nomes com hash) que saíram do manifesto
+        if self.hashed:
+            self.collect_garbage(self.gc_grace_days)
+
         # Gerar arquivos auxiliares
         self.generate_next_config()
         self.generate_component_templates()
@@ -483,6 +1349,8 @@ export function OptimizedImage({
         print(f"💾 Tamanho original: {total_original_mb:.1f} MB")
         print(f"💾 Tamanho otimizado: {total_optimized_mb:.1f} MB")
         print(f"🎯 Economia total: {total_savings_mb:.1f} MB ({savings_percent:.1f}%)")
+        if self.normalize:
+            print(f"🧹 Metadados removidos: {self.total_metadata_removed / 1024:.1f} KB")
         
         print("\\n🎉 OTIMIZAÇÃO CONCLUÍDA COM SUCESSO!")
         print("\\n🚀 PRÓXIMOS PASSOS:")
@@ -491,5 +1359,20 @@ export function OptimizedImage({
         print("3. Teste performance com Lighthouse")
 
 if __name__ == "__main__":
-    optimizer = ImageOptimizer()
+    parser = argparse.ArgumentParser(description="Otimização de imagens Hiperliga")
+    parser.add_argument('--sprites', action='store_true',
+                        help=f"Empacotar ícones ({', '.join(SPRITE_CATEGORIES)}) em sprite sheets")
+    parser.add_argument('--keep-metadata', action='store_true',
+                        help="Não converter para sRGB nem remover EXIF/XMP/ICC")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Imagens processadas em paralelo (ordem de prioridade é mantida)")
+    parser.add_argument('--hashed', action='store_true',
+                        help="Incluir hash do conteúdo no nome dos derivados e remover os não referenciados")
+    parser.add_argument('--gc-grace-days', type=int, default=GC_GRACE_DAYS,
+                        help="Dias que derivados não referenciados são mantidos antes da remoção")
+    args = parser.parse_args()
+
+    optimizer = ImageOptimizer(sprites=args.sprites, normalize=not args.keep_metadata,
+                               workers=args.workers, hashed=args.hashed,
+                               gc_grace_days=args.gc_grace_days)
     optimizer.run()
\ No newline at end of file
@@ -18,6 +18,7 @@ import { Card } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
 import { Container } from '@/components/layout/container'
 import { Section } from '@/components/layout/section'
+import { resolveImageSrc } from '@/lib/image-manifest'
 
 // Animation variants
 const fadeInUp = {
@@ -160,7 +161,10 @@ export default function FAQPage() {
       {/* Hero Section */}
       <Section className="relative min-h-[60vh] flex items-center bg-gradient-to-br from-brand-primary via-brand-secondary to-brand-primary text-white overflow-hidden">
         <div className="absolute inset-0 bg-black/20" />
-        <div className="absolute inset-0 bg-[url('/images/03_products/hiperliga/pattern-bg2-optimized.webp')] opacity-10" />
+        <div
+          className="absolute inset-0 opacity-10"
+          style={{ backgroundImage: `url(${resolveImageSrc('/images/03_products/hiperliga/pattern-bg2-optimized.webp')})` }}
+        />
         
         <Container className="relative z-10">
           <motion.div
@@ -24,6 +24,7 @@ import { Badge } from '@/components/ui/badge'
 import { Container } from '@/components/layout/container'
 import { Section } from '@/components/layout/section'
 import { OptimizedImage } from '@/components/ui/optimized-image'
+import { resolveImageSrc } from '@/lib/image-manifest'
 
 // Animation variants
 const fadeInUp = {
@@ -167,22 +168,22 @@ export default function HiperligaPage() {
     {
       title: 'Alvenaria Estrutural',
       description: 'Para construções que exigem alta resistência estrutural',
-      image: '/images/03_products/hiperliga/desempenho-e-durabilidade-usar-1024x1024-optimized.webp'
+      image: resolveImageSrc('/images/03_products/hiperliga/desempenho-e-durabilidade-usar-1024x1024-optimized.webp')
     },
     {
       title: 'Paredes de Vedação',
       description: 'Vedação eficiente com excelente isolamento',
-      image: '/images/03_products/hiperliga/versatilidade-usar-optimized.webp'
+      image: resolveImageSrc('/images/03_products/hiperliga/versatilidade-usar-optimized.webp')
     },
     {
       title: 'Muros e Divisórias',
       description: 'Construção rápida de muros e divisórias internas',
-      image: '/images/03_products/hiperliga/economia-de-espaco-e-material-usar-optimized.webp'
+      image: resolveImageSrc('/images/03_products/hiperliga/economia-de-espaco-e-material-usar-optimized.webp')
     },
     {
       title: 'Obras Comerciais',
       description: 'Ideal para grandes projetos comerciais e industriais',
-      image: '/images/03_products/hiperliga/100-sustentavel-usar-optimized.webp'
+      image: resolveImageSrc('/images/03_products/hiperliga/100-sustentavel-usar-optimized.webp')
     }
   ]
 
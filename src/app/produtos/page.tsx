@@ -19,6 +19,7 @@ import { Section } from '@/components/layout/section'
 import ProductCardDetailed from '@/components/ui/product-card-detailed'
 import type { Product, ProductFilters } from '@/types/product'
 import { ProductUtils } from '@/lib/produtos-utils'
+import { resolveImageSrc } from '@/lib/image-manifest'
 
 // Import the extracted product data
 import productsData from '../../../data/produtos-especificacoes.json'
@@ -107,7 +108,10 @@ export default function ProductsPage() {
       {/* Hero Section */}
       <Section className="relative min-h-[60vh] flex items-center bg-gradient-to-br from-brand-primary via-brand-secondary to-brand-primary text-white overflow-hidden">
         <div className="absolute inset-0 bg-black/20" />
-        <div className="absolute inset-0 bg-[url('/images/03_products/hiperliga/pattern-bg2-optimized.webp')] opacity-10" />
+        <div
+          className="absolute inset-0 opacity-10"
+          style={{ backgroundImage: `url(${resolveImageSrc('/images/03_products/hiperliga/pattern-bg2-optimized.webp')})` }}
+        />
         
         <Container className="relative z-10">
           <motion.div
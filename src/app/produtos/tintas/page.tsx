@@ -18,6 +18,7 @@ import { Card } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
 import { Container } from '@/components/layout/container'
 import { Section } from '@/components/layout/section'
+import { resolveImageSrc } from '@/lib/image-manifest'
 
 const fadeInUp = {
   hidden: { opacity: 0, y: 20 },
@@ -74,7 +75,7 @@ export default function TintasPage() {
             <motion.div className="relative" initial="hidden" animate="visible" variants={fadeInUp}>
               <div className="relative aspect-square rounded-2xl overflow-hidden">
                 <Image
-                  src="/images/03_products/hiperliga/economia-de-espaco-e-material-usar-optimized.webp"
+                  src={resolveImageSrc('/images/03_products/hiperliga/economia-de-espaco-e-material-usar-optimized.webp')}
                   alt="Tintas Gran Finelle"
                   fill
                   className="object-cover"
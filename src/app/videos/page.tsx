@@ -14,6 +14,7 @@ import { Card } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
 import { Container } from '@/components/layout/container'
 import { Section } from '@/components/layout/section'
+import { resolveImageSrc } from '@/lib/image-manifest'
 
 const fadeInUp = {
   hidden: { opacity: 0, y: 20 },
@@ -50,7 +51,7 @@ const videos: VideoItem[] = [
     description: 'Veja passo a passo como aplicar a argamassa polimérica Hiperliga em sua obra',
     category: 'Tutorial',
     youtubeId: 'dQw4w9WgXcQ', // Placeholder
-    thumbnail: '/images/03_products/hiperliga/hiperliga-1-optimized.webp',
+    thumbnail: resolveImageSrc('/images/03_products/hiperliga/hiperliga-1-optimized.webp'),
     duration: '8:32'
   },
   {
@@ -59,7 +60,7 @@ const videos: VideoItem[] = [
     description: 'Comparação prática demonstrando as vantagens da Hiperliga sobre métodos tradicionais',
     category: 'Comparativo',
     youtubeId: 'dQw4w9WgXcQ', // Placeholder
-    thumbnail: '/images/03_products/hiperliga/desempenho-e-durabilidade-usar-1024x1024-optimized.webp',
+    thumbnail: resolveImageSrc('/images/03_products/hiperliga/desempenho-e-durabilidade-usar-1024x1024-optimized.webp'),
     duration: '5:45'
   },
   {
@@ -68,7 +69,7 @@ const videos: VideoItem[] = [
     description: 'Mestre de obras relata a experiência usando Hiperliga em construção residencial',
     category: 'Depoimento',
     youtubeId: 'dQw4w9WgXcQ', // Placeholder
-    thumbnail: '/images/03_products/hiperliga/versatilidade-usar-optimized.webp',
+    thumbnail: resolveImageSrc('/images/03_products/hiperliga/versatilidade-usar-optimized.webp'),
     duration: '3:20'
   },
   {
@@ -77,7 +78,7 @@ const videos: VideoItem[] = [
     description: 'Demonstração da aplicação de texturas e grafiatos da linha Gran Finelle',
     category: 'Tutorial',
     youtubeId: 'dQw4w9WgXcQ', // Placeholder
-    thumbnail: '/images/03_products/hiperliga/economia-de-espaco-e-material-usar-optimized.webp',
+    thumbnail: resolveImageSrc('/images/03_products/hiperliga/economia-de-espaco-e-material-usar-optimized.webp'),
     duration: '6:15'
   },
   {
@@ -86,7 +87,7 @@ const videos: VideoItem[] = [
     description: 'Entenda como a Hiperliga contribui para uma construção mais sustentável',
     category: 'Institucional',
     youtubeId: 'dQw4w9WgXcQ', // Placeholder
-    thumbnail: '/images/03_products/hiperliga/100-sustentavel-usar-optimized.webp',
+    thumbnail: resolveImageSrc('/images/03_products/hiperliga/100-sustentavel-usar-optimized.webp'),
     duration: '4:30'
   },
   {
@@ -95,7 +96,7 @@ const videos: VideoItem[] = [
     description: 'Cobertura da participação da Gran Finelle na principal feira do setor',
     category: 'Eventos',
     youtubeId: 'dQw4w9WgXcQ', // Placeholder
-    thumbnail: '/images/03_products/image_11-optimized.webp',
+    thumbnail: resolveImageSrc('/images/03_products/image_11-optimized.webp'),
     duration: '7:10'
   }
 ]
@@ -146,7 +147,10 @@ export default function VideosPage() {
       {/* Hero Section */}
       <Section className="relative min-h-[60vh] flex items-center bg-gradient-to-br from-brand-primary via-brand-secondary to-brand-primary text-white overflow-hidden">
         <div className="absolute inset-0 bg-black/20" />
-        <div className="absolute inset-0 bg-[url('/images/03_products/hiperliga/pattern-bg2-optimized.webp')] opacity-10" />
+        <div
+          className="absolute inset-0 opacity-10"
+          style={{ backgroundImage: `url(${resolveImageSrc('/images/03_products/hiperliga/pattern-bg2-optimized.webp')})` }}
+        />
         
         <Container className="relative z-10">
           <motion.div
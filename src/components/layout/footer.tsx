@@ -12,6 +12,7 @@ import {
 
 import { MAIN_NAVIGATION, CONTACT_INFO, COMPANY_INFO, SITE_CONFIG } from '@/lib/constants'
 import { cn } from '@/lib/utils'
+import { resolveImageSrc } from '@/lib/image-manifest'
 
 interface FooterProps {
   className?: string
@@ -64,7 +65,7 @@ export function Footer({ className }: FooterProps) {
               <div className="flex items-center space-x-3">
                 <div className="relative h-12 w-12">
                   <Image
-                    src="/images/01_brand/logo_hiperliga-optimized.webp"
+                    src={resolveImageSrc('/images/01_brand/logo_hiperliga-optimized.webp')}
                     alt="Logo Hiperliga"
                     fill
                     className="object-contain"
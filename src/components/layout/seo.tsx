@@ -1,6 +1,7 @@
 import * as React from 'react'
 import Head from 'next/head'
 import { DEFAULT_SEO, SITE_CONFIG } from '@/lib/constants'
+import { resolveImageSrc } from '@/lib/image-manifest'
 import type { SEOData } from '@/types'
 
 interface SEOProps extends Partial<SEOData> {
@@ -101,7 +102,7 @@ export function SEO({
             "@type": "Organization",
             "name": "Gran Finelle",
             "url": SITE_CONFIG.url,
-            "logo": `${SITE_CONFIG.url}/images/01_brand/logo_hiperliga-optimized.webp`,
+            "logo": `${SITE_CONFIG.url}${resolveImageSrc('/images/01_brand/logo_hiperliga-optimized.webp')}`,
             "description": SITE_CONFIG.description,
             "address": {
               "@type": "PostalAddress",
@@ -6,6 +6,7 @@ import { usePerformanceMonitor } from '@/hooks/use-performance-monitor'
 import { useServiceWorker } from '@/hooks/use-service-worker'
 import { performanceBudgetMonitor, getPageTypeBudget } from '@/lib/performance-budgets'
 import { monitorImagePerformance, preloadCriticalImages } from '@/lib/image-optimization'
+import { resolveImageSrc } from '@/lib/image-manifest'
 import { optimizeWebFonts } from '@/lib/font-optimization'
 
 interface PerformanceContextValue {
@@ -67,7 +68,7 @@ export function PerformanceProvider({
     monitorImagePerformance()
 
     // Preload critical images based on page type
-    const criticalImages = getCriticalImagesForPage(pathname)
+    const criticalImages = getCriticalImagesForPage(pathname).map(src => resolveImageSrc(src))
     if (criticalImages.length > 0) {
       preloadCriticalImages(criticalImages)
     }
@@ -6,6 +6,7 @@ import Image, { ImageProps } from 'next/image'
 import { cn } from '@/lib/utils'
 import { useState, useRef, useEffect } from 'react'
 import { Loading } from '@/components/ui/loading'
+import { resolveImageSrc } from '@/lib/image-manifest'
 
 interface OptimizedImageProps extends Omit<ImageProps, 'src' | 'alt'> {
   src: string
@@ -39,6 +40,9 @@ export function OptimizedImage({
   const [isInView, setIsInView] = useState(false)
   const imgRef = useRef<HTMLDivElement>(null)
 
+  // Resolve to the current derivative (hashed names) from the build-time manifest
+  const resolvedSrc = resolveImageSrc(src)
+
   // Intersection Observer for lazy loading and analytics
   useEffect(() => {
     if (!imgRef.current || priority) return
@@ -136,7 +140,7 @@ export function OptimizedImage({
       
       {shouldLoad ? (
         <Image
-          src={src}
+          src={resolvedSrc}
           alt={alt}
           className={cn(
             'transition-all duration-500 ease-out',
@@ -157,7 +161,7 @@ export function OptimizedImage({
               window.gtag('event', 'image_loaded', {
                 event_category: 'performance',
                 event_label: category,
-                custom_parameter_1: src
+                custom_parameter_1: resolvedSrc
               })
             }
           }}
@@ -168,7 +172,7 @@ export function OptimizedImage({
             if (typeof window !== 'undefined' && window.gtag) {
               window.gtag('event', 'image_error', {
                 event_category: 'performance',
-                event_label: src
+                event_label: resolvedSrc
               })
             }
           }}
@@ -1,4 +1,5 @@
 import type { SiteConfig, ContactInfo, NavigationItem } from '@/types'
+import { resolveImageSrc } from '@/lib/image-manifest'
 
 // Site configuration
 export const SITE_CONFIG: SiteConfig = {
@@ -130,19 +131,19 @@ export const GRAN_FINELLE_PRODUCTS = [
   {
     name: 'Texturas',
     description: 'Revestimentos texturizados de alta qualidade',
-    image: '/images/03_products/hiperliga/versatilidade-usar-optimized.webp',
+    image: resolveImageSrc('/images/03_products/hiperliga/versatilidade-usar-optimized.webp'),
     href: '/produtos/texturas',
   },
   {
     name: 'Grafiatos',
     description: 'Acabamentos decorativos para fachadas e interiores',
-    image: '/images/03_products/hiperliga/desempenho-e-durabilidade-usar-1024x1024-optimized.webp',
+    image: resolveImageSrc('/images/03_products/hiperliga/desempenho-e-durabilidade-usar-1024x1024-optimized.webp'),
     href: '/produtos/texturas#grafiatos',
   },
   {
     name: 'Tintas',
     description: 'Linha completa de tintas imobiliárias',
-    image: '/images/03_products/hiperliga/economia-de-espaco-e-material-usar-optimized.webp',
+    image: resolveImageSrc('/images/03_products/hiperliga/economia-de-espaco-e-material-usar-optimized.webp'),
     href: '/produtos/tintas',
   },
 ]
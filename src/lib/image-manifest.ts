@@ -0,0 +1,156 @@
+// Resolve image paths through the manifest generated by scripts/optimize_images.py
+// With --hashed, derivatives carry a content hash in their filename, so they are
+// safe to serve with `immutable` caching; only the manifest itself is revalidated.
+//
+// The manifest is imported at build time so server and client render the same src.
+// Re-run `next build` after optimize_images.py to pick up new hashes.
+import manifestData from '@/public/images/image_manifest.json'
+
+export type ManifestImageFormat = 'avif' | 'webp' | 'jpg'
+export type ManifestAnimationFormat = 'avif' | 'webp' | 'mp4' | 'webm'
+export type ManifestBreakpoint = 'mobile' | 'tablet' | 'desktop' | 'xl'
+
+type FormatMap = Partial<Record<ManifestImageFormat, string>>
+type AssetFormat = ManifestImageFormat | ManifestAnimationFormat
+
+export interface ImageManifestEntry {
+  category: string
+  width: number
+  height: number
+  optimized: FormatMap
+  responsive?: Partial<Record<ManifestBreakpoint, FormatMap>>
+  animated?: Partial<Record<ManifestAnimationFormat, string>>
+  best_format?: string | null
+  loop?: number | null
+}
+
+export interface ImageManifest {
+  updated?: string
+  images: Record<string, ImageManifestEntry>
+  sprites: Record<string, unknown>
+}
+
+export const IMAGE_MANIFEST = manifestData as ImageManifest
+
+interface ResolvedKey {
+  entry: ImageManifestEntry
+  breakpoint?: ManifestBreakpoint
+  format?: AssetFormat
+}
+
+// Animated outputs an <img> can display; mp4/webm only when requested explicitly
+const ANIMATED_IMAGE_FORMATS: ManifestAnimationFormat[] = ['avif', 'webp']
+
+const aliasIndexes = new WeakMap<ImageManifest, Map<string, ResolvedKey>>()
+
+// Index originals plus the stable derivative names the code already references
+// ({stem}-optimized.{fmt}, {stem}-{breakpoint}.{fmt}) so they map to the current file
+function getAliasIndex(manifest: ImageManifest): Map<string, ResolvedKey> {
+  const cached = aliasIndexes.get(manifest)
+  if (cached) return cached
+
+  const index = new Map<string, ResolvedKey>()
+  for (const [original, entry] of Object.entries(manifest.images ?? {})) {
+    index.set(original, { entry })
+
+    const base = original.replace(/\.[^./]+$/, '')
+    // Animations: optimized holds only the jpg poster, the real outputs are in animated
+    const optimizedFormats = [
+      ...Object.keys(entry.optimized),
+      ...Object.keys(entry.animated ?? {}),
+    ] as AssetFormat[]
+    for (const format of optimizedFormats) {
+      index.set(`${base}-optimized.${format}`, { entry, format })
+    }
+    for (const [breakpoint, variants] of Object.entries(entry.responsive ?? {})) {
+      for (const format of Object.keys(variants ?? {}) as ManifestImageFormat[]) {
+        index.set(`${base}-${breakpoint}.${format}`, {
+          entry,
+          breakpoint: breakpoint as ManifestBreakpoint,
+          format,
+        })
+      }
+    }
+  }
+
+  aliasIndexes.set(manifest, index)
+  return index
+}
+
+// Resolve an original path (e.g. /images/02_hero/hero.jpg) or a stable derivative path
+// (e.g. /images/02_hero/hero-optimized.webp) to its current derivative.
+// Falls back to the given path when the image is not in the manifest.
+export function resolveImageSrc(
+  src: string,
+  options: { breakpoint?: ManifestBreakpoint; format?: AssetFormat } = {},
+  manifest: ImageManifest = IMAGE_MANIFEST
+): string {
+  const resolved = getAliasIndex(manifest).get(src)
+  if (!resolved) return src
+
+  const { entry } = resolved
+  const requested = options.format ?? resolved.format
+  const animated = resolveAnimatedSrc(entry, requested)
+  if (animated) return animated
+
+  const breakpoint = options.breakpoint ?? resolved.breakpoint
+  const formats: AssetFormat[] = [requested ?? 'webp', 'jpg']
+  const candidates = [breakpoint ? entry.responsive?.[breakpoint] : undefined, entry.optimized]
+
+  for (const variants of candidates) {
+    if (!variants) continue
+    for (const format of formats) {
+      const path = variants[format as ManifestImageFormat]
+      if (path) return path
+    }
+  }
+
+  return src
+}
+
+// Animated entry: requested format, then best_format, then webp (jpg = static poster)
+function resolveAnimatedSrc(
+  entry: ImageManifestEntry,
+  requested?: AssetFormat
+): string | undefined {
+  if (!entry.animated || requested === 'jpg') return undefined
+
+  const bestFormat = ANIMATED_IMAGE_FORMATS.find(format => format === entry.best_format)
+  const order: Array<AssetFormat | undefined> = [requested, bestFormat, 'webp']
+  for (const format of order) {
+    const path = format && entry.animated[format as ManifestAnimationFormat]
+    if (path) return path
+  }
+
+  return undefined
+}
+
+// All formats for a breakpoint, best first — for <picture>/<source> markup
+export function resolveImageSources(
+  src: string,
+  breakpoint?: ManifestBreakpoint,
+  manifest: ImageManifest = IMAGE_MANIFEST
+): Array<{ format: ManifestImageFormat; src: string }> {
+  const resolved = getAliasIndex(manifest).get(src)
+  if (!resolved) return []
+
+  const { entry } = resolved
+  const target = breakpoint ?? resolved.breakpoint
+  // Animations: animated avif/webp first, jpg poster last
+  const variants: FormatMap = entry.animated
+    ? { ...entry.optimized, ...pickImageFormats(entry.animated) }
+    : (target && entry.responsive?.[target]) || entry.optimized
+  const order: ManifestImageFormat[] = ['avif', 'webp', 'jpg']
+
+  return order
+    .filter(format => variants[format])
+    .map(format => ({ format, src: variants[format] as string }))
+}
+
+function pickImageFormats(animated: Partial<Record<ManifestAnimationFormat, string>>): FormatMap {
+  const formats: FormatMap = {}
+  for (const format of ANIMATED_IMAGE_FORMATS) {
+    if (animated[format]) formats[format] = animated[format]
+  }
+  return formats
+}